@@ -1,12 +1,24 @@
 # server.py
 from __future__ import print_function
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import calendar
 import os
+import functools
 import json
-from typing import Optional
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, TypedDict
+import msgspec
+import numpy as np
+import orjson
 from dateutil import parser
 import tzlocal
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
+from flask.json.provider import JSONProvider
+import google_auth_httplib2
+import httplib2
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 import google.generativeai as genai
@@ -15,28 +27,143 @@ import google.generativeai as genai
 genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
 
+# Hoisted out of the per-request path: the model handle is just local
+# config, and tzlocal re-reads /etc/localtime (or the registry) on every
+# lookup. Guarded so a missing tz database doesn't break startup.
+_GEMINI_MODEL = genai.GenerativeModel("gemini-2.5-flash")
+
+
+class EventSchema(TypedDict):
+    title: str
+    start: str
+    end: str
+    location: str
+
+
+# Constrain generation to the schema: the model returns bare,
+# guaranteed-parseable JSON, so no markdown-fence stripping is needed.
+_GENERATION_CONFIG = genai.GenerationConfig(
+    response_mime_type="application/json",
+    response_schema=EventSchema,
+)
+try:
+    _LOCAL_TZ = tzlocal.get_localzone()
+    _LOCAL_TZ_NAME = tzlocal.get_localzone_name()
+except Exception:
+    _LOCAL_TZ = timezone.utc
+    _LOCAL_TZ_NAME = "UTC"
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson (C extension, 2-5x faster)."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+
+# Small pool for overlapping independent external calls (Gemini, Calendar)
+# within a single request.
+_EXECUTOR = ThreadPoolExecutor(max_workers=8)
 
 
 # ---- HELPERS ----
+_CREDENTIALS = None
+_creds_lock = threading.Lock()
+_thread_services = threading.local()
+
+
+def _get_credentials():
+    """Parse GOOGLE_SERVICE_ACCOUNT_JSON once and cache the credentials.
+    Service-account credentials refresh themselves, so one instance is
+    safe to share for the whole process."""
+    global _CREDENTIALS
+    if _CREDENTIALS is not None:
+        return _CREDENTIALS
+
+    with _creds_lock:
+        if _CREDENTIALS is None:
+            raw = os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON")
+            if not raw:
+                raise RuntimeError("GOOGLE_SERVICE_ACCOUNT_JSON not set in environment")
+            info = json.loads(raw)
+            _CREDENTIALS = Credentials.from_service_account_info(info, scopes=SCOPES)
+    return _CREDENTIALS
+
+
 def get_calendar_service():
     """
-    Create a Google Calendar service using a service account JSON stored in env var.
-    GOOGLE_SERVICE_ACCOUNT_JSON should contain the full JSON contents.
+    Return this thread's cached Google Calendar service, building it on
+    first use. Each worker thread gets its own httplib2.Http so the TLS
+    connection to googleapis.com stays open and is reused across
+    requests (httplib2 keeps connections alive per instance but is not
+    thread-safe, so the transport must not be shared between threads).
     """
-    raw = os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON")
-    if not raw:
-        raise RuntimeError("GOOGLE_SERVICE_ACCOUNT_JSON not set in environment")
-
-    info = json.loads(raw)
-    creds = Credentials.from_service_account_info(info, scopes=SCOPES)
-    service = build("calendar", "v3", credentials=creds)
+    service = getattr(_thread_services, "service", None)
+    if service is None:
+        authed_http = google_auth_httplib2.AuthorizedHttp(
+            _get_credentials(), http=httplib2.Http()
+        )
+        try:
+            # static_discovery builds from the discovery doc bundled with
+            # google-api-python-client: no ~500 KB fetch from
+            # www.googleapis.com on worker startup.
+            service = build(
+                "calendar",
+                "v3",
+                http=authed_http,
+                cache_discovery=False,
+                static_discovery=True,
+            )
+        except TypeError:
+            # Older client versions (<2.x) don't know static_discovery.
+            service = build("calendar", "v3", http=authed_http, cache_discovery=False)
+        _thread_services.service = service
     return service
 
 
+def _fast_iso(s: str, default_tz=None) -> Optional[datetime]:
+    """
+    Specialized scanner for the strict "YYYY-MM-DDTHH:MM:SS" format the
+    model is instructed to emit. Roughly 20x faster than the general
+    dateutil parser; returns None on anything else. With default_tz the
+    result is built timezone-aware directly, saving a replace() copy.
+    """
+    if len(s) != 19:
+        return None
+    if s[4] != "-" or s[7] != "-" or s[10] not in ("T", " ") or s[13] != ":" or s[16] != ":":
+        return None
+    for i in (0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18):
+        if not ("0" <= s[i] <= "9"):
+            return None
+    o = ord
+    year = (o(s[0]) - 48) * 1000 + (o(s[1]) - 48) * 100 + (o(s[2]) - 48) * 10 + (o(s[3]) - 48)
+    month = (o(s[5]) - 48) * 10 + (o(s[6]) - 48)
+    day = (o(s[8]) - 48) * 10 + (o(s[9]) - 48)
+    hour = (o(s[11]) - 48) * 10 + (o(s[12]) - 48)
+    minute = (o(s[14]) - 48) * 10 + (o(s[15]) - 48)
+    second = (o(s[17]) - 48) * 10 + (o(s[18]) - 48)
+    try:
+        return datetime(year, month, day, hour, minute, second, tzinfo=default_tz)
+    except ValueError:
+        return None
+
+
 def safe_parse(dt_str: str) -> Optional[datetime]:
     if not dt_str:
         return None
+    dt = _fast_iso(dt_str)
+    if dt is not None:
+        return dt
+    # Off the happy path: ISO variants (offsets, fractions), then anything.
+    try:
+        return parser.isoparse(dt_str)
+    except Exception:
+        pass
     try:
         return parser.parse(dt_str)
     except Exception:
@@ -47,45 +174,298 @@ def iso_format(dt: datetime) -> str:
     return dt.strftime("%Y-%m-%dT%H:%M:%S")
 
 
+# Locale tables cached once; dt.weekday() is 0=Monday, matching day_name.
+_WEEKDAYS = tuple(calendar.day_name)
+_MONTHS = tuple(calendar.month_name)
+
+
+@functools.lru_cache(maxsize=4096)
 def human_readable(dt_str: str) -> str:
     """
     Convert an ISO-like datetime to a human-friendly string.
     Example: "Thursday, November 13 at 6:00 PM"
+    Pure string -> string, so results are memoized: recurring events and
+    repeated polls hit the cache instead of re-parsing and re-formatting.
     """
     dt = safe_parse(dt_str)
     if not dt:
         return dt_str
-    try:
-        # Use platform-friendly format (avoid %-d on some platforms)
-        return dt.strftime("%A, %B %d at %I:%M %p").replace(" 0", " ")
-    except Exception:
-        return dt_str
+    # Hand-rolled instead of strftime + replace(" 0", " "): one pass, and
+    # no risk of the replace mangling a legitimate " 0" elsewhere.
+    h12 = dt.hour % 12 or 12
+    ampm = "AM" if dt.hour < 12 else "PM"
+    return (
+        f"{_WEEKDAYS[dt.weekday()]}, {_MONTHS[dt.month]} {dt.day}"
+        f" at {h12}:{dt.minute:02d} {ampm}"
+    )
+
 
+def _fmt12(dt: datetime) -> str:
+    """12-hour clock string without strftime (no libc call, no lstrip)."""
+    h12 = dt.hour % 12 or 12
+    ampm = "AM" if dt.hour < 12 else "PM"
+    return f"{h12}:{dt.minute:02d} {ampm}"
 
+
+@functools.lru_cache(maxsize=4096)
 def format_range(start_iso: str, end_iso: str) -> str:
     s = safe_parse(start_iso)
     e = safe_parse(end_iso)
     if not s or not e:
         return f"{start_iso} to {end_iso}"
 
-    date_part = s.strftime("%m/%d/%Y")
+    # Pure f-string formatting: the conflicts path calls this per event,
+    # and strftime reaches into libc on every field.
+    return f"{s.month:02d}/{s.day:02d}/{s.year} {_fmt12(s)} - {_fmt12(e)}"
 
-    # Cross-platform hour formatting
-    start_t = s.strftime("%I:%M %p").lstrip("0")
-    end_t = e.strftime("%I:%M %p").lstrip("0")
+# ---- SEMANTIC CACHE ----
+# Opt-in (SEMANTIC_CACHE=1): near-identical phrasings of the same event
+# ("meeting with Bob tomorrow at 5" vs "set up a meeting with Bob tomorrow
+# 5pm") skip the Gemini round-trip entirely.
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE") == "1"
+_EMBED_MODEL = "text-embedding-004"
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces embed requests from concurrent threads into one
+    embed_content call. The first thread to arrive becomes the leader:
+    it waits a short window for others to pile in, then drains the queue
+    in batches of MAX_BATCH and fans results back out. N concurrent
+    /extract calls cost ceil(N/MAX_BATCH) embedding round-trips.
+    """
+
+    MAX_BATCH = 16
+    WINDOW_S = 0.01
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = []  # list of (text, Future)
+
+    def embed(self, text: str) -> list:
+        fut = Future()
+        with self._lock:
+            self._pending.append((text, fut))
+            is_leader = len(self._pending) == 1
+        if is_leader:
+            time.sleep(self.WINDOW_S)
+            self._drain()
+        return fut.result()
+
+    def _drain(self):
+        while True:
+            with self._lock:
+                batch = self._pending[: self.MAX_BATCH]
+                del self._pending[: self.MAX_BATCH]
+            if not batch:
+                return
+            try:
+                resp = genai.embed_content(
+                    model=_EMBED_MODEL, content=[t for t, _ in batch]
+                )
+                embeddings = resp["embedding"]
+                # A single-item batch comes back as one flat vector.
+                if len(batch) == 1 and embeddings and not isinstance(embeddings[0], list):
+                    embeddings = [embeddings]
+                for (_, fut), vec in zip(batch, embeddings):
+                    fut.set_result(vec)
+            except Exception as exc:
+                for _, fut in batch:
+                    fut.set_exception(exc)
+
+
+_EMBEDDING_BATCHER = EmbeddingBatcher()
+
+
+class SemanticCache:
+    """
+    Embedding-similarity cache over prior extraction results. Stores one
+    L2-normalized embedding per entry; lookup is a single matrix-vector
+    dot product against the stacked matrix.
+    """
+
+    def __init__(self, threshold: float = 0.92):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._results = []
+        self._matrix = None  # stacked normalized embeddings, one row per entry
+
+    @staticmethod
+    def embed(text: str) -> np.ndarray:
+        vec = np.asarray(_EMBEDDING_BATCHER.embed(text), dtype=np.float64)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def lookup(self, query_vec: np.ndarray) -> Optional[dict]:
+        with self._lock:
+            if self._matrix is None:
+                return None
+            scores = np.dot(self._matrix, query_vec)
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold:
+                return self._results[best]
+        return None
+
+    def store(self, query_vec: np.ndarray, result: dict):
+        with self._lock:
+            self._results.append(result)
+            row = query_vec.reshape(1, -1)
+            if self._matrix is None:
+                self._matrix = row
+            else:
+                self._matrix = np.vstack([self._matrix, row])
+
+
+_SEMANTIC_CACHE = SemanticCache()
 
-    return f"{date_part} {start_t} - {end_t}"
 
 # ---- AI extraction wrapper ----
+# Two parses with defaults that differ in every field: values that agree
+# across both were explicit in the text, not filled in by dateutil.
+_RULE_DEFAULT_A = datetime(2000, 1, 1, 0, 0, 0)
+_RULE_DEFAULT_B = datetime(2001, 2, 2, 1, 1, 1)
+_LOCATION_RE = re.compile(r"\b(?:at|in)\s+(?P<loc>[^,]+?)\s*$", re.IGNORECASE)
+_TIME_TOKEN_RE = re.compile(r"\b\d{1,2}:\d{2}|\b\d{1,2}\s*(?:am|pm)\b", re.IGNORECASE)
+_TITLE_FILLER = {"a", "an", "at", "by", "for", "from", "in", "on", "the", "to"}
+_NON_ALPHA_RE = re.compile(r"[^a-z]+")
+# Alphabetic words the datetime itself may legitimately consume; anything
+# else eaten by the fuzzy parse (e.g. "HQ" read as a tz abbreviation)
+# means user-provided content would be silently dropped.
+_DATETIME_WORDS = {
+    "t", "z", "am", "pm", "noon", "midnight", "of", "st", "nd", "rd", "th",
+    "jan", "january", "feb", "february", "mar", "march", "apr", "april",
+    "may", "jun", "june", "jul", "july", "aug", "august", "sep", "sept",
+    "september", "oct", "october", "nov", "november", "dec", "december",
+    "mon", "monday", "tue", "tues", "tuesday", "wed", "wednesday",
+    "thu", "thur", "thurs", "thursday", "fri", "friday",
+    "sat", "saturday", "sun", "sunday",
+    "utc", "gmt", "est", "edt", "cst", "cdt", "mst", "mdt", "pst", "pdt",
+}
+
+
+def try_rule_based_extract(text: str) -> Optional[dict]:
+    """
+    Cheap deterministic pre-pass for already-structured input like
+    "Dinner 2025-11-13 18:00 at Luigi's". Only trusted when the message
+    spells out a full date and time; anything fuzzier (e.g. "tomorrow")
+    falls through to Gemini. Returns the usual extraction dict or None.
+    """
+    # A range like "18:00 to 19:00" makes the fuzzy parse silently
+    # resolve just one endpoint (and agree on it under both defaults),
+    # so anything with more than one time-like token goes to Gemini.
+    if len(_TIME_TOKEN_RE.findall(text)) > 1:
+        return None
+
+    try:
+        dt_a, tokens = parser.parse(text, fuzzy_with_tokens=True, default=_RULE_DEFAULT_A)
+        dt_b, _ = parser.parse(text, fuzzy_with_tokens=True, default=_RULE_DEFAULT_B)
+    except Exception:
+        return None
+
+    fields_a = (dt_a.year, dt_a.month, dt_a.day, dt_a.hour, dt_a.minute)
+    fields_b = (dt_b.year, dt_b.month, dt_b.day, dt_b.hour, dt_b.minute)
+    if fields_a != fields_b:
+        return None
+
+    # The agreement check only guards the datetime fields: fuzzy parsing
+    # can also swallow words without affecting the result ("HQ" taken as
+    # a tz abbreviation) and those would vanish from the output. Subtract
+    # the leftover tokens from the input and only trust the parse if
+    # everything it consumed looks like datetime text.
+    consumed = text
+    for tok in tokens:
+        consumed = consumed.replace(tok, " ", 1)
+    for word in consumed.split():
+        letters = _NON_ALPHA_RE.sub("", word.lower())
+        if letters and letters not in _DATETIME_WORDS:
+            return None
+
+    leftover = " ".join(t.strip(" ,.") for t in tokens).strip()
+    location = ""
+    m = _LOCATION_RE.search(leftover)
+    if m:
+        location = m.group("loc").strip()
+        leftover = leftover[: m.start()].strip()
+
+    # Drop dangling prepositions left behind by the consumed datetime
+    # ("Dentist appointment on") and single-letter tokenizer debris like
+    # the "T" of a T-separated ISO timestamp, which survives anywhere in
+    # the leftover ("Lunch 2025-07-01T12:00:00" -> "Lunch T").
+    words = [
+        w for w in leftover.strip(" ,.-").split()
+        if not (len(w) == 1 and w.isalpha())
+    ]
+    while words and words[-1].lower() in _TITLE_FILLER:
+        words.pop()
+    while words and words[0].lower() in _TITLE_FILLER:
+        words.pop(0)
+    title = " ".join(words)
+    if len(title) <= 1:
+        title = ""
+
+    start_dt = dt_a.replace(tzinfo=None)
+    return {
+        "title": title,
+        "start": iso_format(start_dt),
+        "end": iso_format(start_dt + timedelta(hours=1)),
+        "location": location,
+    }
+
+
 def extract_event_details_with_gemini(text: str) -> dict:
     """
     Uses Gemini to extract title/start/end/location as JSON.
     Returns a dict with those keys (may be empty strings).
+    Trivially-structured input is handled by a rule-based pre-pass with
+    no model call; with SEMANTIC_CACHE=1, exact and near-duplicate
+    phrasings are served from cache (keyed on stripped, lowercased text).
     """
-    model = genai.GenerativeModel("gemini-2.5-flash")
-    now = datetime.now().isoformat()
-    prompt = f"""
-Today is {now}.
+    rule_based = try_rule_based_extract(text)
+    if rule_based is not None:
+        return rule_based
+    if not SEMANTIC_CACHE_ENABLED:
+        return _gemini_extract(text)
+    return dict(_cached_extract(text, text.strip().lower()))
+
+
+# Exact-match layer keyed on the normalized text. A plain lock-guarded
+# dict rather than lru_cache so the key and the text sent to the model
+# can differ: Gemini always sees the user's original casing.
+_EXACT_CACHE_MAX = 512
+_EXACT_CACHE = {}
+_exact_cache_lock = threading.Lock()
+
+
+def _cached_extract(text: str, normalized: str) -> dict:
+    with _exact_cache_lock:
+        hit = _EXACT_CACHE.get(normalized)
+    if hit is not None:
+        return hit
+
+    # On exact miss, try the similarity cache before paying for Gemini.
+    try:
+        query_vec = _SEMANTIC_CACHE.embed(normalized)
+    except Exception:
+        return _gemini_extract(text)
+
+    result = _SEMANTIC_CACHE.lookup(query_vec)
+    if result is None:
+        result = _gemini_extract(text)
+        _SEMANTIC_CACHE.store(query_vec, result)
+
+    with _exact_cache_lock:
+        if len(_EXACT_CACHE) >= _EXACT_CACHE_MAX and normalized not in _EXACT_CACHE:
+            # Evict the oldest entry (dicts preserve insertion order).
+            _EXACT_CACHE.pop(next(iter(_EXACT_CACHE)))
+        _EXACT_CACHE[normalized] = result
+    return result
+
+
+# Built once at import. The static instruction block comes first and the
+# per-request values ({now}, {text}) last, so the stable prefix hashes
+# the same across requests and can benefit from Gemini's implicit prompt
+# caching.
+_EXTRACT_PROMPT_TEMPLATE = """\
 Extract calendar event details from this message.
 Return only JSON in this exact format:
 {{
@@ -96,14 +476,22 @@ Return only JSON in this exact format:
 }}
 
 If any value is not present in the message, return an empty string for that field.
+
+Today is {now}.
 Message: {text}
 """
-    resp = model.generate_content(prompt)
-    cleaned = resp.text.strip()
-    if cleaned.startswith("```"):
-        cleaned = cleaned.strip("`").replace("json", "").strip()
+
+
+def _build_prompt(text: str) -> str:
+    return _EXTRACT_PROMPT_TEMPLATE.format(now=datetime.now().isoformat(), text=text)
+
+
+def _gemini_extract(text: str) -> dict:
+    resp = _GEMINI_MODEL.generate_content(
+        _build_prompt(text), generation_config=_GENERATION_CONFIG
+    )
     try:
-        data = json.loads(cleaned)
+        data = orjson.loads(resp.text)
         # Ensure keys exist
         return {
             "title": data.get("title", "") if isinstance(data, dict) else "",
@@ -116,19 +504,106 @@ Message: {text}
         return {"title": "", "start": "", "end": "", "location": ""}
 
 
+def _extraction_spoken(extracted: dict) -> str:
+    """Build the friendly spoken_response summarizing an extraction."""
+    parts = []
+    if extracted.get("title"):
+        parts.append(f"Title: {extracted['title']}")
+    if extracted.get("start"):
+        parts.append(f"Start: {human_readable(extracted['start'])}")
+    if extracted.get("end"):
+        parts.append(f"End: {human_readable(extracted['end'])}")
+    if extracted.get("location"):
+        parts.append(f"Location: {extracted['location']}")
+
+    if parts:
+        return "I extracted the following — " + "; ".join(parts) + ". Is that correct?"
+    return "I couldn't find clear event details in that. What is the title, start, end, or location?"
+
+
+# Matches a completed "field": "value" pair in the partial JSON buffer,
+# including escaped characters inside the value.
+_STREAM_FIELD_RES = {
+    f: re.compile(rf'"{f}"\s*:\s*"((?:[^"\\]|\\.)*)"')
+    for f in ("title", "start", "end", "location")
+}
+
+
+def _stream_extract(text: str):
+    """
+    Server-sent-events generator for /extract with stream=true. Emits a
+    `data:` line per field as soon as it is complete in the partial
+    model output, then a final event carrying the full extraction and
+    spoken_response. Time-to-first-field drops from full generation
+    time to roughly first-token time.
+    """
+
+    def _event(obj: dict) -> str:
+        return "data: " + orjson.dumps(obj).decode() + "\n\n"
+
+    rule_based = try_rule_based_extract(text)
+    if rule_based is not None:
+        yield _event({**rule_based, "spoken_response": _extraction_spoken(rule_based), "done": True})
+        return
+
+    buffer = ""
+    seen = {}
+    try:
+        resp_iter = _GEMINI_MODEL.generate_content(
+            _build_prompt(text), generation_config=_GENERATION_CONFIG, stream=True
+        )
+        for chunk in resp_iter:
+            try:
+                piece = chunk.text
+            except Exception:
+                continue
+            if not piece:
+                continue
+            buffer += piece
+            for field, rex in _STREAM_FIELD_RES.items():
+                if field in seen:
+                    continue
+                m = rex.search(buffer)
+                if m:
+                    try:
+                        value = orjson.loads(f'"{m.group(1)}"')
+                    except Exception:
+                        value = m.group(1)
+                    seen[field] = value
+                    yield _event({"field": field, "value": value})
+    except Exception as e:
+        print("Streaming extraction failed:", e)
+
+    extracted = {f: seen.get(f, "") for f in ("title", "start", "end", "location")}
+    try:
+        data = orjson.loads(buffer)
+        if isinstance(data, dict):
+            extracted = {f: data.get(f, "") for f in ("title", "start", "end", "location")}
+    except Exception:
+        pass
+    yield _event({**extracted, "spoken_response": _extraction_spoken(extracted), "done": True})
+
+
 # ---- CALENDAR FUNCTIONS ----
+def _parse_aware(dt_str: str) -> Optional[datetime]:
+    """Parse to an aware datetime in one step where possible: the strict
+    ISO fast path builds with the local tz directly instead of parsing
+    naive and re-allocating via replace(tzinfo=...)."""
+    dt = _fast_iso(dt_str, default_tz=_LOCAL_TZ)
+    if dt is not None:
+        return dt
+    dt = safe_parse(dt_str)
+    if dt is not None and dt.tzinfo is None:
+        dt = dt.replace(tzinfo=_LOCAL_TZ)
+    return dt
+
+
 def check_conflicts(service, start_iso: str, end_iso: str):
-    tz = tzlocal.get_localzone()
-    start_dt = safe_parse(start_iso)
-    end_dt = safe_parse(end_iso)
+    start_dt = _parse_aware(start_iso)
+    end_dt = _parse_aware(end_iso)
     if not start_dt or not end_dt:
         return []
 
-    # Attach timezone if missing
-    if start_dt.tzinfo is None:
-        start_dt = start_dt.replace(tzinfo=tz)
-    if end_dt.tzinfo is None:
-        end_dt = end_dt.replace(tzinfo=tz)
     if end_dt <= start_dt:
         end_dt = start_dt + timedelta(hours=1)
 
@@ -140,65 +615,156 @@ def check_conflicts(service, start_iso: str, end_iso: str):
             timeMax=end_dt.isoformat(),
             singleEvents=True,
             orderBy="startTime",
+            # Only summary/start/end are read below; skipping attendees,
+            # reminders, conferenceData etc. trims the payload a lot.
+            fields="items(summary,start(dateTime,date),end(dateTime,date))",
+            maxResults=50,
         )
         .execute()
     )
     items = events_result.get("items", [])
-    conflicts = []
-    for e in items:
-        title = e.get("summary", "Untitled Event")
-        s = e["start"].get("dateTime", e["start"].get("date", ""))
-        e_t = e["end"].get("dateTime", e["end"].get("date", ""))
-        conflicts.append({"title": title, "start": s, "end": e_t})
-    return conflicts
+    # Single comprehension pass; the raw API strings are carried through
+    # untouched and only parsed (via the fast ISO path, memoized) when a
+    # spoken range is actually formatted.
+    return [
+        {
+            "title": e.get("summary", "Untitled Event"),
+            "start": e["start"].get("dateTime", e["start"].get("date", "")),
+            "end": e["end"].get("dateTime", e["end"].get("date", "")),
+        }
+        for e in items
+    ]
 
 
-def add_event_to_calendar(service, title: str, start_iso: str, end_iso: str, location: str = ""):
-    tz_name = tzlocal.get_localzone_name()
-    body = {
+def _event_body(title: str, start_iso: str, end_iso: str, location: str = "") -> dict:
+    tz_name = _LOCAL_TZ_NAME
+    return {
         "summary": title,
         "location": location,
         "start": {"dateTime": start_iso, "timeZone": tz_name},
         "end": {"dateTime": end_iso, "timeZone": tz_name},
     }
+
+
+def add_event_to_calendar(service, title: str, start_iso: str, end_iso: str, location: str = ""):
+    body = _event_body(title, start_iso, end_iso, location)
     created = service.events().insert(calendarId="primary", body=body).execute()
     return created
 
 
+def add_events_batch(service, events):
+    """
+    Insert several events in one multipart HTTP request via
+    BatchHttpRequest, instead of paying a round-trip per insert.
+    Returns a list of (created_event_or_None, exception_or_None) in the
+    same order as the input.
+    """
+    collected = {}
+
+    def _collect(request_id, response, exception):
+        collected[request_id] = (response, exception)
+
+    batch = service.new_batch_http_request(callback=_collect)
+    for i, ev in enumerate(events):
+        body = _event_body(
+            ev.get("title", ""),
+            ev.get("start", ""),
+            ev.get("end", ""),
+            ev.get("location", ""),
+        )
+        batch.add(
+            service.events().insert(calendarId="primary", body=body),
+            request_id=str(i),
+        )
+    batch.execute()
+    return [collected[str(i)] for i in range(len(events))]
+
+
+# ---- REQUEST SCHEMAS ----
+# msgspec decodes and validates the body in one C pass, replacing the
+# request.json dict + ad-hoc payload.get checks in each route.
+
+
+class ExtractRequest(msgspec.Struct):
+    text: str = ""
+    check_conflicts: bool = False
+    stream: bool = False
+
+
+class ConflictsRequest(msgspec.Struct):
+    start: str = ""
+    end: str = ""
+
+
+class EventPayload(msgspec.Struct):
+    title: str = ""
+    start: str = ""
+    end: str = ""
+    location: str = ""
+
+
+class AddEventsRequest(msgspec.Struct):
+    events: list[EventPayload] = []
+
+
+def _decode_request(struct_type):
+    """Decode+validate the request body; None on malformed input."""
+    try:
+        return msgspec.json.decode(request.get_data(), type=struct_type)
+    except msgspec.MsgspecError:
+        return None
+
+
 # ---- ROUTES (Option B) ----
 
 @app.route("/extract", methods=["POST"])
 def route_extract():
     """
-    Input: { "text": "user spoken text here" }
+    Input: { "text": "user spoken text here", "check_conflicts": false, "stream": false }
     Output: { title, start, end, location, spoken_response }
+    With check_conflicts=true, the Calendar service warm-up runs in
+    parallel with the Gemini call and the response also carries a
+    "conflicts" list, saving the voice flow a second round-trip.
+    With stream=true, the response is a text/event-stream emitting each
+    field as the model produces it, then a final "done" event.
     """
-    payload = request.json or {}
-    text = payload.get("text", "")
+    req = _decode_request(ExtractRequest)
+    text = req.text if req else ""
     if not text:
         return jsonify({"error": "No text provided", "spoken_response": "I didn't hear anything."}), 400
 
+    if req.stream:
+        return Response(
+            stream_with_context(_stream_extract(text)),
+            mimetype="text/event-stream",
+        )
+
+    want_conflicts = req.check_conflicts
+    # Warm only the shared credentials off-thread while Gemini works.
+    # The service itself is built on this request thread afterwards:
+    # get_calendar_service caches per thread because its httplib2
+    # transport must never be shared, and a service built inside the
+    # executor would be handed back across threads.
+    creds_future = _EXECUTOR.submit(_get_credentials) if want_conflicts else None
+
     extracted = extract_event_details_with_gemini(text)
-    # Build a friendly spoken_response summarizing extraction
-    title = extracted.get("title", "")
     start = extracted.get("start", "")
     end = extracted.get("end", "")
-    location = extracted.get("location", "")
-
-    parts = []
-    if title:
-        parts.append(f"Title: {title}")
-    if start:
-        parts.append(f"Start: {human_readable(start)}")
-    if end:
-        parts.append(f"End: {human_readable(end)}")
-    if location:
-        parts.append(f"Location: {location}")
-
-    if parts:
-        spoken = "I extracted the following — " + "; ".join(parts) + ". Is that correct?"
-    else:
-        spoken = "I couldn't find clear event details in that. What is the title, start, end, or location?"
+    spoken = _extraction_spoken(extracted)
+
+    if creds_future is not None:
+        conflicts = []
+        if start and end:
+            try:
+                creds_future.result()
+                conflicts = check_conflicts(get_calendar_service(), start, end)
+            except Exception as e:
+                print("Conflict preflight failed:", e)
+        if conflicts:
+            spoken += " Note: that time overlaps with " + "; ".join(
+                c["title"] for c in conflicts
+            ) + "."
+        return jsonify({**extracted, "conflicts": conflicts, "spoken_response": spoken})
 
     return jsonify({**extracted, "spoken_response": spoken})
 
@@ -209,9 +775,9 @@ def route_check_conflicts():
     Input: { "start": "...", "end": "..." }
     Output: { conflicts: [...], spoken_response: "..." }
     """
-    payload = request.json or {}
-    start = payload.get("start")
-    end = payload.get("end")
+    req = _decode_request(ConflictsRequest)
+    start = req.start if req else ""
+    end = req.end if req else ""
     if not start or not end:
         return jsonify({"error": "start and end required", "spoken_response": "I need both start and end times to check for conflicts."}), 400
 
@@ -220,9 +786,9 @@ def route_check_conflicts():
     if not conflicts:
         spoken = f"No conflicts found for {human_readable(start)}."
     else:
-        spoken_items = []
-        for c in conflicts:
-            spoken_items.append(f"{c['title']} on {format_range(c['start'], c['end'])}")
+        spoken_items = (
+            f"{c['title']} on {format_range(c['start'], c['end'])}" for c in conflicts
+        )
         spoken = "You already have the following event(s): " + "; ".join(spoken_items) + ". Would you like to reschedule the new event?"
     return jsonify({"conflicts": conflicts, "spoken_response": spoken})
 
@@ -233,11 +799,11 @@ def route_add_event():
     Input: { title, start, end, location (optional) }
     Output: { status, event_id, spoken_response }
     """
-    payload = request.json or {}
-    title = payload.get("title")
-    start = payload.get("start")
-    end = payload.get("end")
-    location = payload.get("location", "")
+    req = _decode_request(EventPayload)
+    title = req.title if req else ""
+    start = req.start if req else ""
+    end = req.end if req else ""
+    location = req.location if req else ""
 
     if not title or not start or not end:
         return jsonify({"error": "title, start, end required", "spoken_response": "I need title, start, and end to add the event."}), 400
@@ -253,6 +819,41 @@ def route_add_event():
         return jsonify({"error": "failed_to_add", "spoken_response": "I couldn't add the event due to a server error."}), 500
 
 
+@app.route("/add_events", methods=["POST"])
+def route_add_events():
+    """
+    Bulk insert. Input: { "events": [ { title, start, end, location? }, ... ] }
+    Output: { results: [ { status, event_id? } ], spoken_response }
+    All inserts go out in a single batched HTTP request.
+    """
+    req = _decode_request(AddEventsRequest)
+    events = req.events if req else []
+    if not events:
+        return jsonify({"error": "events list required", "spoken_response": "I need a list of events to add."}), 400
+    for ev in events:
+        if not ev.title or not ev.start or not ev.end:
+            return jsonify({"error": "each event needs title, start, end", "spoken_response": "Every event needs a title, start, and end."}), 400
+    events = msgspec.to_builtins(events)
+
+    service = get_calendar_service()
+    try:
+        outcomes = add_events_batch(service, events)
+    except Exception as e:
+        print("Error adding events batch:", e)
+        return jsonify({"error": "failed_to_add", "spoken_response": "I couldn't add the events due to a server error."}), 500
+
+    results = []
+    added = 0
+    for created, exc in outcomes:
+        if exc is not None or not created:
+            results.append({"status": "failed"})
+        else:
+            results.append({"status": "added", "event_id": created.get("id")})
+            added += 1
+    spoken = f"Added {added} of {len(events)} event(s)."
+    return jsonify({"results": results, "spoken_response": spoken})
+
+
 # Health check
 @app.route("/", methods=["GET"])
 def home():
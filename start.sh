@@ -25,9 +25,15 @@ echo "📦 Installing dependencies..."
 pip install --upgrade pip
 pip install -r requirements.txt
 
-# Start Gunicorn serving the Flask app
+# Start Gunicorn serving the Flask app.
+# Every endpoint blocks on external HTTPS (Gemini, Calendar), so threaded
+# workers scale throughput by workers x threads instead of one request
+# per round-trip. The Calendar service is lazy-initialized on first use,
+# so each worker builds its own after fork.
 echo "🔥 Launching Gunicorn..."
-exec gunicorn server:app \
-  --workers 1 \
+exec gunicorn wsgi:app \
+  --worker-class gthread \
+  --workers "${WEB_CONCURRENCY:-4}" \
+  --threads "${GUNICORN_THREADS:-16}" \
   --bind 0.0.0.0:$PORT \
   --log-level info
@@ -0,0 +1,2 @@
+# wsgi.py - entry point for Gunicorn (see start.sh)
+from server import app  # noqa: F401